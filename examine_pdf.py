@@ -4,22 +4,33 @@ import sys
 from datetime import datetime
 import PyPDF2 #
 
+try:
+    import fitz # PyMuPDF
+except ImportError:
+    fitz = None
+
 def extract_text_from_pdf(pdf_path):
-    """Extract text from a PDF file."""
+    """Extract text from a PDF file (PyMuPDF if available, PyPDF2 otherwise)."""
     text_by_page = {}
     
     try:
+        if fitz is not None:
+            with fitz.open(pdf_path) as doc:
+                for i, page in enumerate(doc): # Iterate through pages
+                    text = page.get_text("text")
+                    if text:
+                        text_by_page[i+1] = text  # Page numbers start from 1
+            
+            return text_by_page
+        
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file) #
             
             # Extract text from each page
-            i = 0 # Initialize loop variable
-            while i < len(reader.pages): # Iterate through pages
-                page = reader.pages[i]
+            for i, page in enumerate(reader.pages): # Iterate through pages
                 text = page.extract_text() #
                 if text:
                     text_by_page[i+1] = text  # Page numbers start from 1
-                i += 1 # Increment loop variable
             
         return text_by_page
     except Exception as e:
@@ -35,14 +46,9 @@ def analyze_pdf_structure(pdf_path):
     print(f"Number of pages: {len(text_by_page)}")
     
     # Print a sample of text from each page (first 200 chars)
-    page_nums = list(text_by_page.keys()) # Get keys to iterate with index
-    j = 0 # Initialize loop variable
-    while j < len(page_nums): # Iterate through page numbers
-        page_num = page_nums[j]
-        text = text_by_page[page_num]
+    for page_num, text in text_by_page.items():
         print(f"\nPage {page_num} sample:")
         print(text[:200] + "..." if len(text) > 200 else text)
-        j += 1 # Increment loop variable
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
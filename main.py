@@ -26,6 +26,8 @@ def parse_arguments():
                         help='Path to the output JSON file')
     parser.add_argument('--debug', '-d', action='store_true',
                         help='Enable debug mode')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Directory for caching extracted PDF text between runs (disabled by default)')
     
     return parser.parse_args()
 
@@ -78,7 +80,10 @@ def validate_input(input_path):
             print(f"Error: PDF directory '{pdf_dir}' does not exist")
             return False
         
-        # Check if all document files exist
+        # Check if all document files exist; list the directory once instead of
+        # stat-ing every file, falling back to a stat only for names not listed
+        # (nested paths, case-insensitive filesystems)
+        present = set(os.listdir(pdf_dir))
         doc_index = 0 # Initialize loop variable
         while doc_index < len(input_data['documents']): # Iterate through documents
             doc = input_data['documents'][doc_index]
@@ -87,7 +92,7 @@ def validate_input(input_path):
                 return False
             
             pdf_path = os.path.join(pdf_dir, doc['filename'])
-            if not os.path.exists(pdf_path):
+            if doc['filename'] not in present and not os.path.exists(pdf_path):
                 print(f"Error: Document file '{pdf_path}' does not exist")
                 return False
             doc_index += 1 # Increment loop variable
@@ -120,7 +125,7 @@ def main():
     
     # Process documents
     try:
-        system = DocumentIntelligenceSystem(debug=args.debug)
+        system = DocumentIntelligenceSystem(debug=args.debug, cache_dir=args.cache_dir)
         system.process_documents(args.input, args.output)
         
         print(f"Document intelligence process completed successfully")
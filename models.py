@@ -0,0 +1,86 @@
+"""
+Data Model Module
+
+This module defines the Section and Subsection objects passed between the PDF
+extraction, section processing and relevance ranking modules.
+"""
+
+from typing import Dict, List, Any, Optional
+
+class Subsection:
+    """
+    A paragraph-sized piece of a section.
+    """
+    
+    __slots__ = ('text', 'page_number')
+    
+    def __init__(self, text: str, page_number: int):
+        self.text = text
+        self.page_number = page_number
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the subsection to its JSON-style dict.
+        
+        Returns:
+            Dictionary with text and page_number
+        """
+        return {'text': self.text, 'page_number': self.page_number}
+    
+    def __repr__(self) -> str:
+        return f"Subsection(page {self.page_number}, {len(self.text)} chars)"
+
+class Section:
+    """
+    A section of a PDF document, as it moves through processing and ranking.
+    
+    Uses __slots__ rather than a dict per section, which keeps large documents
+    compact and makes field access a plain attribute lookup. The metadata fields
+    stay None until the stage that computes them has run (keywords, sentences and
+    word_count in SectionProcessor.enrich_sections, relevance_score and
+    importance_rank in RelevanceRanker); call to_dict() where the JSON-style dict
+    is needed.
+    """
+    
+    __slots__ = ('document', 'section_title', 'page_number', 'content', 'subsections',
+                 'keywords', 'sentences', 'word_count', 'relevance_score', 'importance_rank')
+    
+    # Optional fields, in the order to_dict() emits them
+    _OPTIONAL_FIELDS = ('keywords', 'sentences', 'word_count', 'relevance_score', 'importance_rank')
+    
+    def __init__(self, document: str, section_title: str, page_number: int,
+                 content: str = '', subsections: Optional[List[Subsection]] = None):
+        self.document = document
+        self.section_title = section_title
+        self.page_number = page_number
+        self.content = content
+        self.subsections = subsections if subsections is not None else []
+        self.keywords = None
+        self.sentences = None
+        self.word_count = None
+        self.relevance_score = None
+        self.importance_rank = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the section to its JSON-style dict.
+        
+        Returns:
+            Dictionary with document, section_title, page_number, content and
+            subsections, plus each metadata field that has been set
+        """
+        section = {
+            'document': self.document,
+            'section_title': self.section_title,
+            'page_number': self.page_number,
+            'content': self.content,
+            'subsections': [subsection.to_dict() for subsection in self.subsections]
+        }
+        for field in self._OPTIONAL_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                section[field] = value
+        return section
+    
+    def __repr__(self) -> str:
+        return f"Section({self.document!r}, {self.section_title!r}, page {self.page_number})"
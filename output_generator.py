@@ -7,7 +7,43 @@ This module provides functionality for generating the final output in the requir
 import os
 import json
 import datetime
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Tuple, Optional
+
+# orjson is a C extension and serializes much faster than the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _extract_and_process(pdf_path: str, debug: bool = False, page_workers: int = 1,
+                         cache_dir: Optional[str] = None) -> List[Any]:
+    """
+    Extract and process the sections of a single PDF.
+    
+    Defined at module level so it can be dispatched to worker processes.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        debug: Whether to print debug information
+        page_workers: Number of processes used for per-page extraction
+        cache_dir: Directory for cached extraction results (None disables the cache)
+        
+    Returns:
+        List of processed Section objects for the document
+    """
+    from pdf_extractor import PDFTextExtractor
+    from section_processor import SectionProcessor
+    
+    extractor = PDFTextExtractor(debug=debug, page_workers=page_workers, cache_dir=cache_dir)
+    processor = SectionProcessor(debug=debug)
+    
+    # Extract text from PDF
+    text_by_page = extractor.extract_text_from_pdf(pdf_path)
+    
+    # Process sections
+    document_name = os.path.basename(pdf_path)
+    return processor.process_sections(text_by_page, document_name)
 
 class OutputGenerator:
     """
@@ -27,9 +63,10 @@ class OutputGenerator:
                         input_documents: List[str],
                         persona: str,
                         job: str,
-                        ranked_sections: List[Dict[str, Any]],
+                        ranked_sections: List[Any],
                         subsection_analysis: List[Dict[str, Any]],
-                        max_sections: int = 5) -> Dict[str, Any]:
+                        max_sections: int = 5,
+                        timestamp: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate the final output in the required JSON format.
         
@@ -37,19 +74,24 @@ class OutputGenerator:
             input_documents: List of input document filenames
             persona: Persona description
             job: Job-to-be-done description
-            ranked_sections: List of ranked sections
+            ranked_sections: List of ranked Section objects
             subsection_analysis: List of analyzed subsections
             max_sections: Maximum number of sections to include in the output
+            timestamp: Processing timestamp to record; defaults to the current time.
+                Callers generating several outputs can compute it once and pass it in.
             
         Returns:
             Dictionary containing the final output in the required format
         """
+        if timestamp is None:
+            timestamp = datetime.datetime.now().isoformat()
+        
         # Prepare metadata
         metadata = {
             'input_documents': input_documents,
             'persona': persona,
             'job_to_be_done': job,
-            'processing_timestamp': datetime.datetime.now().isoformat()
+            'processing_timestamp': timestamp
         }
         
         # Prepare extracted sections (top N based on importance rank)
@@ -57,12 +99,12 @@ class OutputGenerator:
         section_index = 0 # Initialize loop variable
         while section_index < len(ranked_sections): # Iterate through ranked_sections
             section = ranked_sections[section_index]
-            if section.get('importance_rank', float('inf')) <= max_sections:
+            if section.importance_rank is not None and section.importance_rank <= max_sections:
                 extracted_section = {
-                    'document': section.get('document', ''),
-                    'section_title': section.get('section_title', ''),
-                    'importance_rank': section.get('importance_rank', 0),
-                    'page_number': section.get('page_number', 0)
+                    'document': section.document,
+                    'section_title': section.section_title,
+                    'importance_rank': section.importance_rank,
+                    'page_number': section.page_number
                 }
                 extracted_sections.append(extracted_section)
             section_index += 1 # Increment loop variable
@@ -88,8 +130,12 @@ class OutputGenerator:
             output_path: Path to write the output to
         """
         try:
-            with open(output_path, 'w') as f:
-                json.dump(output, f, indent=4)
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w') as f:
+                    json.dump(output, f, indent=4)
             
             if self.debug:
                 print(f"Output written to {output_path}")
@@ -103,25 +149,31 @@ class DocumentIntelligenceSystem:
     Main system class that orchestrates the document intelligence process.
     """
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, cache_dir: Optional[str] = None):
         """
         Initialize the document intelligence system.
         
         Args:
             debug: Whether to print debug information
+            cache_dir: Directory for cached PDF extraction results (None disables the cache)
         """
         self.debug = debug
+        self.cache_dir = cache_dir
         
-        # Import modules here to avoid circular imports
-        from pdf_extractor import PDFTextExtractor
-        from section_processor import SectionProcessor
-        from relevance_ranker import RelevanceRanker
-        
-        self.extractor = PDFTextExtractor(debug=debug)
-        self.processor = SectionProcessor(debug=debug)
-        self.ranker = RelevanceRanker(debug=debug)
+        # Extraction and section processing happen in _extract_and_process.
+        # The ranker is built on first use; see the ranker property
+        self._ranker = None
         self.generator = OutputGenerator(debug=debug)
     
+    @property
+    def ranker(self):
+        """Relevance ranker, created on first access."""
+        if self._ranker is None:
+            # Imported lazily so that scikit-learn is not loaded until sections are ranked
+            from relevance_ranker import RelevanceRanker
+            self._ranker = RelevanceRanker(debug=self.debug)
+        return self._ranker
+    
     def process_documents(self, input_json_path: str, output_json_path: str) -> None:
         """
         Process documents based on the input JSON and generate the output JSON.
@@ -169,28 +221,25 @@ class DocumentIntelligenceSystem:
                 print(f"Persona: {persona}")
                 print(f"Job: {job}")
             
-            # Process each document
+            # Process each document; PDFs are independent, so spread them across processes
             all_sections = []
-            pdf_path_index = 0 # Initialize loop variable for pdf_paths
-            while pdf_path_index < len(document_paths): # Iterate through document_paths
-                pdf_path = document_paths[pdf_path_index]
-                # Extract text from PDF
-                text_by_page = self.extractor.extract_text_from_pdf(pdf_path)
-                
-                # Process sections
-                document_name = os.path.basename(pdf_path)
-                sections = self.processor.process_sections(text_by_page, document_name)
-                
-                # Add sections to the list
-                # This loop remains 'for' because extend operation directly on list.
-                # If 'sections' was an iterable to be manually iterated, it would be 'while'.
-                # To convert this to a while loop strictly:
-                section_item_index = 0
-                while section_item_index < len(sections):
-                    all_sections.append(sections[section_item_index])
-                    section_item_index += 1
-                
-                pdf_path_index += 1 # Increment loop variable
+            if len(document_paths) > 1:
+                max_workers = min(os.cpu_count() or 1, len(document_paths))
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    # map() keeps results in document order so ranking stays deterministic;
+                    # documents are already parallel, so pages are extracted serially
+                    results = list(executor.map(_extract_and_process, document_paths,
+                                                [self.debug] * len(document_paths),
+                                                [1] * len(document_paths),
+                                                [self.cache_dir] * len(document_paths)))
+            else:
+                # The collection PDFs are far below PARALLEL_PAGE_THRESHOLD, so a page
+                # pool would only add startup cost; extract pages serially
+                results = [_extract_and_process(pdf_path, self.debug, 1, self.cache_dir)
+                           for pdf_path in document_paths]
+            
+            for sections in results:
+                all_sections.extend(sections)
             
             # Rank sections by relevance
             ranked_sections, subsection_analysis = self.ranker.process_sections(all_sections, persona, job)
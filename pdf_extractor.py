@@ -5,54 +5,243 @@ This module provides functionality for extracting text from PDF documents,
 preserving page numbers, and preprocessing the text for better section identification.
 """
 
+import io
 import os
 import re
+import json
+import math
+import hashlib
+import tempfile
 import PyPDF2 #
-from typing import Dict, List, Any, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union, Iterator
+from models import Section, Subsection
+from text_utils import collapse_whitespace
+
+# PyMuPDF is a C-backed parser and much faster than PyPDF2; use it when present
+try:
+    import fitz # PyMuPDF
+except ImportError:
+    fitz = None
+
+# Minimum page count before per-page work is spread across processes. Every
+# worker receives and reparses the whole PDF; for the bundled PDFs (at most 32
+# pages) that extra work is as large as the serial extraction itself, and only
+# from about 128 pages does it fall clearly below it
+PARALLEL_PAGE_THRESHOLD = 128
+
+# Bump whenever extraction or preprocessing changes the cached text
+CACHE_FORMAT_VERSION = 1
+
+# Precompiled patterns used by preprocessing
+_HEADER_RE = re.compile(r'^.*Page \d+.*\n', re.MULTILINE)
+_FOOTER_RE = re.compile(r'\n.*Page \d+.*$', re.MULTILINE)
+
+# Patterns for identifying section titles, in priority order
+_SECTION_PATTERNS = (
+    r'^([A-Z][A-Za-z\s\-:]{3,50})$',  # Capitalized text (3-50 chars)
+    r'^([A-Z][A-Za-z\s\-:]{3,50})[\n\r]',  # Capitalized text followed by newline
+    r'^(\d+\.\s+[A-Z][A-Za-z\s\-:]{3,50})$',  # Numbered sections
+    r'^(Chapter\s+\d+[\s\-:]+[A-Za-z\s\-:]{3,50})$',  # Chapter headings
+)
+
+# All section patterns as one alternation; group N belongs to pattern N-1, and the
+# first alternative that matches is the first pattern in priority order that matches.
+# Titles the length/header check rejects ("Page", "Contents", "Index", or three letters
+# before a carriage return) cannot match any later pattern, so one match decides
+_SECTION_TITLE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _SECTION_PATTERNS))
+
+# Every section pattern starts with an uppercase letter or a digit, so only lines whose
+# first non-blank character is one of those can be titles; one scan per page finds them
+_TITLE_CANDIDATE_RE = re.compile(r'^[^\S\n]*[A-Z\d]', re.MULTILINE)
+
+def _preprocess_page_text(text: str) -> str:
+    """
+    Preprocess the extracted text of a page to improve section identification.
+    
+    Args:
+        text: Raw text extracted from a PDF page
+        
+    Returns:
+        Preprocessed text
+    """
+    # Replace multiple spaces with a single space; this also turns every \r into a
+    # space, so there are no line endings left to normalize
+    text = collapse_whitespace(text)
+    
+    # Remove headers and footers (common patterns)
+    text = _HEADER_RE.sub('', text)
+    text = _FOOTER_RE.sub('', text)
+    
+    return text
+
+def _content_lines(text: str) -> List[str]:
+    """
+    Split text into stripped, non-empty lines.
+    
+    Args:
+        text: One or more lines of page text
+        
+    Returns:
+        List of stripped lines, with blank lines dropped
+    """
+    return [line for line in map(str.strip, text.split('\n')) if line]
+
+def _iter_paragraphs(content: str, min_length: int = 50) -> Iterator[str]:
+    """
+    Yield the stripped paragraphs of content that are longer than min_length.
+    
+    Paragraphs are separated by lines containing only whitespace, which gives the
+    same stripped paragraphs as re.split(r'\n\s*\n', content). Runs of lines too
+    short to pass the length check are skipped without being joined.
+    
+    Args:
+        content: Section content
+        min_length: Paragraphs of this many characters or fewer are skipped
+        
+    Yields:
+        Stripped paragraph text
+    """
+    lines = content.split('\n')
+    start = 0  # Index of the first line of the current paragraph
+    length = 0  # Upper bound on the stripped paragraph length
+    lines.append('')  # Blank sentinel flushes the last paragraph
+    for line_idx, line in enumerate(lines):
+        if line and not line.isspace():
+            length += len(line) + 1
+        else:
+            if length > min_length:
+                paragraph = '\n'.join(lines[start:line_idx]).strip()
+                if len(paragraph) > min_length:
+                    yield paragraph
+            start = line_idx + 1
+            length = 0
+
+def _extract_pymupdf_pages(doc, start: int, stop: int) -> Dict[int, str]:
+    """
+    Extract and preprocess text for the pages in [start, stop) of an open PyMuPDF document.
+    
+    Each page is preprocessed as soon as it is read, so only one page of raw
+    text is alive at a time.
+    
+    Args:
+        doc: Open PyMuPDF document
+        start: Index of the first page (0-based)
+        stop: Index after the last page (0-based)
+        
+    Returns:
+        Dictionary mapping page numbers to preprocessed text (pages without text are skipped)
+    """
+    text_by_page = {}
+    
+    for i in range(start, stop):
+        text = doc[i].get_text("text")
+        if text:
+            text_by_page[i+1] = _preprocess_page_text(text)  # Page numbers start from 1
+    
+    return text_by_page
+
+def _extract_pymupdf_page_range(pdf_bytes: bytes, start: int, stop: int) -> Dict[int, str]:
+    """
+    Worker entry point: open the PDF and extract a block of pages.
+    
+    PyMuPDF documents cannot be pickled, so each worker reopens the document
+    from the PDF bytes.
+    
+    Args:
+        pdf_bytes: Raw bytes of the PDF file
+        start: Index of the first page (0-based)
+        stop: Index after the last page (0-based)
+        
+    Returns:
+        Dictionary mapping page numbers to preprocessed text
+    """
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return _extract_pymupdf_pages(doc, start, stop)
 
 class PDFTextExtractor:
     """
     Class for extracting text from PDF documents with advanced preprocessing.
     """
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, page_workers: int = 1,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the PDF text extractor.
         
         Args:
             debug: Whether to print debug information
+            page_workers: Number of processes used to extract pages of large PDFs
+                (defaults to 1, which disables per-page parallelism; the pool is
+                only used on multi-core machines)
+            cache_dir: Directory for cached extraction results; the cache is off
+                unless a directory is given
         """
         self.debug = debug
+        self.page_workers = page_workers
+        self.cache_dir = cache_dir
+        # Most recent extraction, keyed by (path, mtime, size)
+        self._last_extraction = None
     
-    def extract_text_from_pdf(self, pdf_path: str) -> Dict[int, str]:
+    def extract_text_from_pdf(self, pdf_path: Union[str, bytes]) -> Dict[int, str]:
         """
         Extract text from a PDF file, organized by page number.
         
+        Uses PyMuPDF when it is installed and falls back to PyPDF2 otherwise.
+        The file is read into memory once and the same bytes are hashed for the
+        cache and handed to the parser.
+        
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or the raw bytes of the PDF
             
         Returns:
-            Dictionary mapping page numbers to extracted text
+            Dictionary mapping page numbers to extracted text; keys are integers
+            inserted in ascending page order
+        
+        When a cache directory is configured, results are cached on disk keyed by
+        the SHA-256 of the PDF bytes, so unchanged documents are not parsed again
+        on later runs. The most recent
+        result for a path is also kept in memory and reused while the file's
+        modification time and size are unchanged.
         """
-        text_by_page = {}
+        if isinstance(pdf_path, bytes):
+            pdf_bytes = pdf_path
+            pdf_path = '<bytes>'
+        else:
+            pdf_bytes = None
         
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file) #
+            memo_key = None
+            if pdf_bytes is None:
+                stat = os.stat(pdf_path)
+                memo_key = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+                if self._last_extraction is not None and self._last_extraction[0] == memo_key:
+                    return dict(self._last_extraction[1])
                 
-                # Extract text from each page
-                i = 0 # Initialize loop variable
-                while i < len(reader.pages): # Iterate through pages
-                    page = reader.pages[i]
-                    text = page.extract_text() #
-                    if text:
-                        # Preprocess the text
-                        text = self._preprocess_text(text)
-                        text_by_page[i+1] = text  # Page numbers start from 1
-                    i += 1 # Increment loop variable
+                with open(pdf_path, 'rb') as file:
+                    pdf_bytes = file.read()
+            
+            cache_path = self._get_cache_path(pdf_bytes)
+            cached = self._load_cached_text(cache_path)
+            if cached is not None:
+                if self.debug:
+                    print(f"Loaded cached text for {pdf_path} ({len(cached)} pages)")
+                if memo_key is not None:
+                    self._last_extraction = (memo_key, dict(cached))
+                return cached
+            
+            # Pages are preprocessed as they are read
+            if fitz is not None:
+                text_by_page = self._extract_with_pymupdf(pdf_bytes)
+            else:
+                text_by_page = self._extract_with_pypdf2(pdf_bytes)
                 
             if self.debug:
                 print(f"Extracted text from {pdf_path} ({len(text_by_page)} pages)")
+            
+            self._store_cached_text(cache_path, text_by_page)
+            if memo_key is not None:
+                self._last_extraction = (memo_key, dict(text_by_page))
                 
             return text_by_page
         except Exception as e:
@@ -60,37 +249,173 @@ class PDFTextExtractor:
                 print(f"Error extracting text from {pdf_path}: {e}")
             return {}
     
-    def _preprocess_text(self, text: str) -> str:
+    def _get_cache_path(self, pdf_bytes: bytes) -> Optional[str]:
         """
-        Preprocess the extracted text to improve section identification.
+        Build the cache file path for a PDF.
+        
+        The key covers the PDF bytes, the extraction backend and its version, and
+        CACHE_FORMAT_VERSION, so switching libraries invalidates old entries.
         
         Args:
-            text: Raw text extracted from a PDF page
+            pdf_bytes: Raw bytes of the PDF file
             
         Returns:
-            Preprocessed text
+            Path of the cache file, or None if caching is disabled
         """
-        # Replace multiple spaces with a single space
-        text = re.sub(r'\s+', ' ', text)
+        if not self.cache_dir:
+            return None
         
-        # Fix line breaks: ensure proper line breaks for paragraphs
-        text = re.sub(r'(\w) (\w)', r'\1 \2', text)  # Fix words split by spaces
+        if fitz is not None:
+            backend = f"pymupdf-{getattr(fitz, 'VersionBind', '')}"
+        else:
+            backend = f"pypdf2-{PyPDF2.__version__}"
         
-        # Normalize newlines
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        hasher = hashlib.sha256(pdf_bytes)
+        hasher.update(f"|{backend}|{CACHE_FORMAT_VERSION}".encode('utf-8'))
         
-        # Remove headers and footers (common patterns)
-        text = re.sub(r'^.*Page \d+.*\n', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\n.*Page \d+.*$', '', text, flags=re.MULTILINE)
+        return os.path.join(self.cache_dir, f"{hasher.hexdigest()}.json")
+    
+    def _load_cached_text(self, cache_path: Optional[str]) -> Optional[Dict[int, str]]:
+        """
+        Load cached page text.
         
-        return text
+        Args:
+            cache_path: Path of the cache file
+            
+        Returns:
+            Dictionary mapping page numbers to text, or None on a cache miss
+        """
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            
+            # JSON object keys are strings; restore integer page numbers
+            text_by_page = {int(key): text for key, text in cached.items()}
+            if not all(isinstance(text, str) for text in text_by_page.values()):
+                raise ValueError("cached page text is not a string")
+        except Exception as e:
+            # An unreadable or malformed entry is dropped so that the document is
+            # extracted again and the entry rewritten, instead of failing every run
+            if self.debug:
+                print(f"Discarding invalid text cache {cache_path}: {e}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+        
+        return text_by_page
+    
+    def _store_cached_text(self, cache_path: Optional[str], text_by_page: Dict[int, str]) -> None:
+        """
+        Store page text in the cache. Failures are ignored.
+        
+        Args:
+            cache_path: Path of the cache file
+            text_by_page: Dictionary mapping page numbers to text
+        """
+        if not cache_path:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
+            # Write to a temporary file first so concurrent readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(text_by_page, f)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                # Do not leave a partial temporary file behind in the cache directory
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except Exception as e:
+            if self.debug:
+                print(f"Error writing text cache {cache_path}: {e}")
+    
+    def _extract_with_pymupdf(self, pdf_bytes: bytes) -> Dict[int, str]:
+        """
+        Extract and preprocess page text using PyMuPDF.
+        
+        Args:
+            pdf_bytes: Raw bytes of the PDF file
+            
+        Returns:
+            Dictionary mapping page numbers to preprocessed text (pages without text are skipped)
+        """
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            page_count = doc.page_count
+            
+            # Small documents are not worth the pool startup cost, and on a single
+            # CPU the workers would only take turns
+            if (self.page_workers <= 1 or page_count <= PARALLEL_PAGE_THRESHOLD
+                    or (os.cpu_count() or 1) <= 1):
+                return _extract_pymupdf_pages(doc, 0, page_count)
+        
+        # Split the pages into one contiguous block per worker
+        workers = min(self.page_workers, page_count)
+        block_size = math.ceil(page_count / workers)
+        starts = list(range(0, page_count, block_size))
+        stops = [min(start + block_size, page_count) for start in starts]
+        
+        text_by_page = {}
+        with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+            results = list(executor.map(_extract_pymupdf_page_range,
+                                        [pdf_bytes] * len(starts), starts, stops))
+        
+        for result in results:  # Merge blocks in page order
+            text_by_page.update(result)
+        
+        return text_by_page
     
-    def extract_sections_from_text(self, text_by_page: Dict[int, str], pdf_path: str) -> List[Dict[str, Any]]:
+    def _extract_with_pypdf2(self, pdf_bytes: bytes) -> Dict[int, str]:
+        """
+        Extract and preprocess page text using PyPDF2.
+        
+        Args:
+            pdf_bytes: Raw bytes of the PDF file
+            
+        Returns:
+            Dictionary mapping page numbers to preprocessed text (pages without text are skipped)
+        """
+        text_by_page = {}
+        
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes)) #
+        
+        # Extract text from each page
+        for page_num, page in enumerate(reader.pages, start=1):  # Page numbers start from 1
+            text = page.extract_text() #
+            if text:
+                text_by_page[page_num] = _preprocess_page_text(text)
+        
+        return text_by_page
+    
+    def _preprocess_text(self, text: str) -> str:
+        """
+        Preprocess the extracted text to improve section identification.
+        
+        Args:
+            text: Raw text extracted from a PDF page
+            
+        Returns:
+            Preprocessed text
+        """
+        return _preprocess_page_text(text)
+    
+    def extract_sections_from_text(self, text_by_page: Dict[int, str], pdf_path: str) -> List[Section]:
         """
         Extract sections from the text based on formatting and content patterns.
         
         Args:
-            text_by_page: Dictionary mapping page numbers to extracted text
+            text_by_page: Dictionary mapping page numbers to extracted text, with
+                integer keys inserted in page order (as extract_text_from_pdf builds it)
             pdf_path: Path to the PDF file
             
         Returns:
@@ -98,109 +423,70 @@ class PDFTextExtractor:
         """
         sections = []
         current_section = None
+        current_lines = []  # Content lines of the current section, joined when it closes
+        document_name = os.path.basename(pdf_path)
         
-        # Patterns for identifying section titles
-        section_patterns = [
-            r'^([A-Z][A-Za-z\s\-:]{3,50})$',  # Capitalized text (3-50 chars)
-            r'^([A-Z][A-Za-z\s\-:]{3,50})[\n\r]',  # Capitalized text followed by newline
-            r'^(\d+\.\s+[A-Z][A-Za-z\s\-:]{3,50})$',  # Numbered sections
-            r'^(Chapter\s+\d+[\s\-:]+[A-Za-z\s\-:]{3,50})$',  # Chapter headings
-        ]
-        
-        # Process each page
-        page_nums = sorted(text_by_page.keys())
-        page_num_idx = 0 # Initialize loop variable
-        while page_num_idx < len(page_nums): # Iterate through page numbers
-            page_num = page_nums[page_num_idx]
-            if isinstance(page_num, str):  # Skip metadata keys
-                page_num_idx += 1 # Increment loop variable
-                continue
+        # Process each page; the dict is already in page order
+        for page_num, text in text_by_page.items():
+            # Only candidate lines need the pattern checks; the lines between them are
+            # plain content and are taken in bulk
+            pos = 0  # End of the last candidate line handled on this page
+            for candidate in _TITLE_CANDIDATE_RE.finditer(text):
+                line_start = candidate.start()
+                if current_section:
+                    current_lines.extend(_content_lines(text[pos:line_start]))
                 
-            text = text_by_page[page_num]
-            lines = text.split('\n')
-            
-            line_idx = 0
-            while line_idx < len(lines):
-                line = lines[line_idx].strip()
+                pos = text.find('\n', line_start)
+                if pos == -1:
+                    pos = len(text)
+                line = text[line_start:pos].strip()
                 
-                # Skip empty lines
-                if not line:
-                    line_idx += 1
-                    continue
-                
-                # Check if line matches any section pattern
+                # Check if line matches any section pattern; the matched group is the title
                 is_section_title = False
-                pattern_idx = 0 # Initialize loop variable
-                while pattern_idx < len(section_patterns): # Iterate through section patterns
-                    pattern = section_patterns[pattern_idx]
-                    match = re.match(pattern, line)
-                    if match:
-                        section_title = match.group(1).strip()
-                        
-                        # Skip very short titles or common headers/footers
-                        if len(section_title) < 4 or section_title.lower() in ['page', 'contents', 'index']:
-                            pattern_idx += 1 # Increment and continue to next pattern
-                            continue
-                        
+                match = _SECTION_TITLE_RE.match(line)
+                if match:
+                    section_title = match.group(match.lastindex).strip()
+                    
+                    # Skip very short titles or common headers/footers
+                    if len(section_title) >= 4 and section_title.lower() not in {'page', 'contents', 'index'}:
                         # If we have a current section, finalize it
                         if current_section:
+                            current_section.content = '\n'.join(current_lines)
                             sections.append(current_section)
                         
                         # Start a new section
-                        current_section = {
-                            'document': os.path.basename(pdf_path),
-                            'section_title': section_title,
-                            'page_number': page_num,
-                            'content': '',
-                            'subsections': []
-                        }
+                        current_section = Section(document_name, section_title, page_num)
+                        current_lines = []
                         
                         is_section_title = True
-                        break # Break from pattern loop
-                    pattern_idx += 1 # Increment loop variable
                 
                 if not is_section_title and current_section:
                     # Add line to current section content
-                    if current_section['content']:
-                        current_section['content'] += '\n'
-                    current_section['content'] += line
-                
-                line_idx += 1
-            page_num_idx += 1 # Increment loop variable
+                    current_lines.append(line)
+            
+            # Lines after the last candidate
+            if current_section:
+                current_lines.extend(_content_lines(text[pos:]))
         
         # Add the last section if it exists
         if current_section:
+            current_section.content = '\n'.join(current_lines)
             sections.append(current_section)
         
         # If no sections were found, create a default section for each page
         if not sections:
-            page_num_keys = list(text_by_page.keys())
-            page_num_keys_idx = 0 # Initialize loop variable
-            while page_num_keys_idx < len(page_num_keys): # Iterate through page numbers
-                page_num = page_num_keys[page_num_keys_idx]
-                if isinstance(page_num, str):  # Skip metadata keys
-                    page_num_keys_idx += 1 # Increment loop variable
-                    continue
-                
-                text = text_by_page[page_num]
-                lines = text.split('\n')
-                title = lines[0].strip() if lines else f"Page {page_num}"
+            for page_num, text in text_by_page.items():
+                # str.split always returns at least one line
+                title = text.split('\n', 1)[0].strip()
                 
                 # Create a section for this page
-                section = {
-                    'document': os.path.basename(pdf_path),
-                    'section_title': title,
-                    'page_number': page_num,
-                    'content': text,
-                    'subsections': []
-                }
+                section = Section(document_name, title, page_num, text)
                 
                 sections.append(section)
-                page_num_keys_idx += 1 # Increment loop variable
         
         return sections
     
-    def identify_subsections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def identify_subsections(self, sections: List[Section]) -> List[Section]:
         """
         Identify subsections within each section.
         
@@ -210,48 +496,41 @@ class PDFTextExtractor:
         Returns:
             Updated list of sections with identified subsections
         """
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(sections): # Iterate through sections
-            section = sections[section_idx]
-            content = section.get('content', '')
-            
-            # Split content into paragraphs
-            paragraphs = re.split(r'\n\s*\n', content)
-            
-            # Process each paragraph as a potential subsection
-            paragraph_idx = 0 # Initialize loop variable
-            while paragraph_idx < len(paragraphs): # Iterate through paragraphs
-                paragraph = paragraphs[paragraph_idx]
-                if len(paragraph.strip()) > 50:  # Minimum length for a subsection
-                    subsection = {
-                        'text': paragraph.strip(),
-                        'page_number': section['page_number']
-                    }
-                    
-                    section['subsections'].append(subsection)
-                paragraph_idx += 1 # Increment loop variable
-            section_idx += 1 # Increment loop variable
+        for section in sections:
+            # Process each paragraph as a potential subsection; paragraphs of 50
+            # characters or fewer are too short to be a subsection
+            for paragraph in _iter_paragraphs(section.content, 50):
+                section.subsections.append(Subsection(paragraph, section.page_number))
         
         return sections
     
-    def process_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def process_pdf(self, pdf_path: str,
+                    text_by_page: Optional[Dict[int, str]] = None,
+                    build_subsections: bool = False) -> List[Section]:
         """
-        Process a PDF file to extract sections and subsections.
+        Process a PDF file to extract sections and, optionally, subsections.
         
         Args:
             pdf_path: Path to the PDF file
+            text_by_page: Text already returned by extract_text_from_pdf for this
+                file; when omitted the PDF is extracted here
+            build_subsections: Whether to split section content into subsections;
+                the ranking pipeline derives its own, so this is off by default
             
         Returns:
             List of sections with page numbers, titles, content, and subsections
+            (left empty unless build_subsections is set)
         """
-        # Extract text from PDF
-        text_by_page = self.extract_text_from_pdf(pdf_path)
+        # Extract text from PDF unless the caller already has it
+        if text_by_page is None:
+            text_by_page = self.extract_text_from_pdf(pdf_path)
         
         # Extract sections from text
         sections = self.extract_sections_from_text(text_by_page, pdf_path)
         
         # Identify subsections
-        sections = self.identify_subsections(sections)
+        if build_subsections:
+            sections = self.identify_subsections(sections)
         
         return sections
 
@@ -266,16 +545,13 @@ if __name__ == "__main__":
     pdf_path = sys.argv[1]
     
     extractor = PDFTextExtractor(debug=True)
-    sections = extractor.process_pdf(pdf_path)
+    sections = extractor.process_pdf(pdf_path, build_subsections=True)
     
     print(f"\nFound {len(sections)} sections:")
-    i = 0 # Initialize loop variable
-    while i < len(sections): # Iterate through sections
-        section = sections[i]
-        print(f"\n{i+1}. {section['section_title']} (Page {section['page_number']})")
-        print(f"   Subsections: {len(section['subsections'])}")
+    for i, section in enumerate(sections, start=1):
+        print(f"\n{i}. {section.section_title} (Page {section.page_number})")
+        print(f"   Subsections: {len(section.subsections)}")
         
         # Print first few characters of content
-        content_preview = section['content'][:100] + "..." if len(section['content']) > 100 else section['content']
+        content_preview = section.content[:100] + "..." if len(section.content) > 100 else section.content
         print(f"   Content: {content_preview}")
-        i += 1 # Increment loop variable
@@ -5,13 +5,19 @@ This module provides functionality for ranking sections by relevance to the pers
 and job-to-be-done using TF-IDF vectorization and other relevance metrics.
 """
 
-import os
-import re
-import math
 import string
 from typing import Dict, List, Any, Tuple
+from models import Section
 from sklearn.feature_extraction.text import TfidfVectorizer #
-from sklearn.metrics.pairwise import cosine_similarity #
+
+# Maps every punctuation character to a space, for str.translate
+_PUNCT_TABLE = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+# Common stopwords dropped from key terms
+_KEY_TERM_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'because', 'as', 'what',
+    'when', 'where', 'how', 'to', 'in', 'for', 'with', 'by', 'of'
+})
 
 class RelevanceRanker:
     """
@@ -26,6 +32,7 @@ class RelevanceRanker:
             debug: Whether to print debug information
         """
         self.debug = debug
+        self._cached_query = None  # (persona, job, query) of the last preprocess_query call
         self.vectorizer = TfidfVectorizer( #
             stop_words='english',
             max_features=5000,
@@ -43,6 +50,10 @@ class RelevanceRanker:
         Returns:
             Preprocessed query
         """
+        # Scoring and subsection analysis ask for the same query; reuse it
+        if self._cached_query is not None and self._cached_query[:2] == (persona, job):
+            return self._cached_query[2]
+        
         # Combine persona and job
         query = f"{persona} {job}"
         
@@ -52,6 +63,7 @@ class RelevanceRanker:
         # Add more weight to job terms by repeating them
         query = f"{query} {' '.join(job_terms)} {' '.join(job_terms)}"
         
+        self._cached_query = (persona, job, query)
         return query
     
     def _extract_key_terms(self, text: str) -> List[str]:
@@ -65,30 +77,17 @@ class RelevanceRanker:
             List of key terms
         """
         # Remove punctuation and convert to lowercase
-        text = text.lower()
-        char_index = 0 # Initialize loop variable
-        while char_index < len(string.punctuation): # Iterate through punctuation
-            char = string.punctuation[char_index]
-            text = text.replace(char, ' ')
-            char_index += 1 # Increment loop variable
+        text = text.lower().translate(_PUNCT_TABLE)
         
         # Split into words
         words = text.split()
         
         # Remove common stopwords
-        stopwords = {'a', 'an', 'the', 'and', 'or', 'but', 'if', 'because', 'as', 'what', 'when', 'where', 'how', 'to', 'in', 'for', 'with', 'by', 'of'}
-        
-        filtered_words = []
-        word_index = 0 # Initialize loop variable
-        while word_index < len(words): # Iterate through words
-            word = words[word_index]
-            if word not in stopwords and len(word) > 2:
-                filtered_words.append(word)
-            word_index += 1 # Increment loop variable
+        filtered_words = [word for word in words if word not in _KEY_TERM_STOPWORDS and len(word) > 2]
         
         return filtered_words
     
-    def calculate_relevance_scores(self, sections: List[Dict[str, Any]], persona: str, job: str) -> List[Dict[str, Any]]:
+    def calculate_relevance_scores(self, sections: List[Section], persona: str, job: str) -> List[Section]:
         """
         Calculate relevance scores for sections based on the persona and job-to-be-done.
         
@@ -108,18 +107,15 @@ class RelevanceRanker:
         
         # Extract section content for vectorization
         section_texts = []
-        section_index = 0 # Initialize loop variable
-        while section_index < len(sections): # Iterate through sections
-            section = sections[section_index]
+        for section in sections:
             # Combine section title and content for better matching
-            title = section.get('section_title', '')
-            content = section.get('content', '')
-            keywords = ' '.join(section.get('keywords', []))
+            title = section.section_title
+            content = section.content
+            keywords = ' '.join(section.keywords or [])
             
             # Create a combined text representation
             combined_text = f"{title} {title} {content} {keywords}"  # Repeat title for more weight
             section_texts.append(combined_text)
-            section_index += 1 # Increment loop variable
         
         # Add the query to the texts for vectorization
         all_texts = section_texts + [query]
@@ -132,25 +128,24 @@ class RelevanceRanker:
             query_vector = tfidf_matrix[-1]  # Last vector is the query
             section_vectors = tfidf_matrix[:-1]  # All except the last are sections
             
-            similarities = cosine_similarity(section_vectors, query_vector) #
+            # Rows are L2-normalized by the vectorizer, so the dot product is the cosine similarity
+            similarities = (section_vectors @ query_vector.T).toarray().ravel()
+            
+            # Key terms are the same for every section, so extract them once
+            persona_terms = self._extract_key_terms(persona)
+            job_terms = self._extract_key_terms(job)
             
             # Add relevance scores to sections
-            i = 0 # Initialize loop variable
-            while i < len(sections): # Iterate through sections
-                section = sections[i]
-                section['relevance_score'] = float(similarities[i][0])
+            for i, section in enumerate(sections):
+                section.relevance_score = float(similarities[i])
                 
                 # Apply additional heuristics to adjust scores
-                self._apply_heuristics(section, persona, job)
-                i += 1 # Increment loop variable
+                self._apply_heuristics(section, persona_terms, job_terms)
             
             if self.debug:
                 print(f"Calculated relevance scores for {len(sections)} sections")
-                dbg_idx = 0 # Initialize loop variable for debug print
-                while dbg_idx < len(sections): # Iterate through sections for debug print
-                    section = sections[dbg_idx]
-                    print(f"  {dbg_idx+1}. {section.get('section_title', 'Untitled')} - Score: {section.get('relevance_score', 0)}")
-                    dbg_idx += 1 # Increment loop variable
+                for dbg_idx, section in enumerate(sections, start=1):
+                    print(f"  {dbg_idx}. {section.section_title} - Score: {section.relevance_score}")
             
             return sections
         
@@ -159,46 +154,38 @@ class RelevanceRanker:
                 print(f"Error calculating relevance scores: {e}")
             
             # If vectorization fails, assign default scores
-            i = 0 # Initialize loop variable
-            while i < len(sections): # Iterate through sections
-                section = sections[i]
-                section['relevance_score'] = 1.0 / (i + 1)  # Simple fallback scoring
-                i += 1 # Increment loop variable
+            for i, section in enumerate(sections):
+                section.relevance_score = 1.0 / (i + 1)  # Simple fallback scoring
             
             return sections
     
-    def _apply_heuristics(self, section: Dict[str, Any], persona: str, job: str) -> None:
+    def _apply_heuristics(self, section: Section, persona_terms: List[str], job_terms: List[str]) -> None:
         """
         Apply heuristics to adjust relevance scores.
         
         Args:
             section: Section to adjust score for
-            persona: Persona description
-            job: Job-to-be-done description
+            persona_terms: Key terms extracted from the persona description
+            job_terms: Key terms extracted from the job-to-be-done description
         """
-        score = section.get('relevance_score', 0.0)
+        score = section.relevance_score if section.relevance_score is not None else 0.0
         
         # Boost score if section title contains key terms from persona or job
-        title = section.get('section_title', '').lower()
-        persona_terms = self._extract_key_terms(persona)
-        job_terms = self._extract_key_terms(job)
+        title = section.section_title.lower()
         
-        term_idx = 0 # Initialize loop variable
-        while term_idx < len(persona_terms): # Iterate through persona terms
-            term = persona_terms[term_idx]
+        for term in persona_terms:
             if term in title:
                 score += 0.1
-            term_idx += 1 # Increment loop variable
         
-        term_idx = 0 # Reset and Initialize loop variable
-        while term_idx < len(job_terms): # Iterate through job terms
-            term = job_terms[term_idx]
+        for term in job_terms:
             if term in title:
                 score += 0.2
-            term_idx += 1 # Increment loop variable
         
-        # Boost score based on content length (longer content might be more informative)
-        word_count = section.get('word_count', 0)
+        # Boost score based on content length (longer content might be more informative);
+        # SectionProcessor.enrich_sections sets word_count, other callers may not
+        word_count = section.word_count
+        if word_count is None:
+            word_count = len(section.content.split())
         if word_count > 500:
             score += 0.1
         elif word_count > 200:
@@ -209,9 +196,9 @@ class RelevanceRanker:
             score -= 0.1
         
         # Update the score
-        section['relevance_score'] = max(0.0, min(1.0, score))  # Clamp between 0 and 1
+        section.relevance_score = max(0.0, min(1.0, score))  # Clamp between 0 and 1
     
-    def rank_sections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def rank_sections(self, sections: List[Section]) -> List[Section]:
         """
         Rank sections by relevance score.
         
@@ -222,18 +209,15 @@ class RelevanceRanker:
             List of sections ranked by relevance score
         """
         # Sort sections by relevance score (descending)
-        ranked_sections = sorted(sections, key=lambda x: x.get('relevance_score', 0.0), reverse=True)
+        ranked_sections = sorted(sections, key=lambda x: x.relevance_score if x.relevance_score is not None else 0.0, reverse=True)
         
         # Add importance rank
-        i = 0 # Initialize loop variable
-        while i < len(ranked_sections): # Iterate through ranked sections
-            section = ranked_sections[i]
-            section['importance_rank'] = i + 1
-            i += 1 # Increment loop variable
+        for rank, section in enumerate(ranked_sections, start=1):
+            section.importance_rank = rank
         
         return ranked_sections
     
-    def select_top_sections(self, ranked_sections: List[Dict[str, Any]], max_sections: int = 5) -> List[Dict[str, Any]]:
+    def select_top_sections(self, ranked_sections: List[Section], max_sections: int = 5) -> List[Section]:
         """
         Select the top N sections by importance rank.
         
@@ -245,17 +229,12 @@ class RelevanceRanker:
             List of top N sections
         """
         # Take top sections based on importance rank
-        top_sections = []
-        s_idx = 0 # Initialize loop variable
-        while s_idx < len(ranked_sections): # Iterate through ranked_sections
-            s = ranked_sections[s_idx]
-            if s.get('importance_rank', float('inf')) <= max_sections:
-                top_sections.append(s)
-            s_idx += 1 # Increment loop variable
+        top_sections = [s for s in ranked_sections
+                        if s.importance_rank is not None and s.importance_rank <= max_sections]
         
         return top_sections
     
-    def analyze_subsections(self, top_sections: List[Dict[str, Any]], persona: str, job: str) -> List[Dict[str, Any]]:
+    def analyze_subsections(self, top_sections: List[Section], persona: str, job: str) -> List[Dict[str, Any]]:
         """
         Analyze subsections within the top-ranked sections.
         
@@ -269,23 +248,24 @@ class RelevanceRanker:
         """
         subsections = []
         
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(top_sections): # Iterate through top sections
-            section = top_sections[section_idx]
+        # The query is the same for every section, so build it once
+        query = self.preprocess_query(persona, job)
+        
+        for section in top_sections:
             # Get subsections
-            section_subsections = section.get('subsections', [])
+            section_subsections = section.subsections
             
-            if section_subsections:
+            if len(section_subsections) == 1:
+                # A lone subsection is the best one whatever it scores (and is also
+                # the fallback if vectorization fails), so skip the vectorizer
+                subsections.append({
+                    'document': section.document,
+                    'refined_text': section_subsections[0].text,
+                    'page_number': section.page_number
+                })
+            elif section_subsections:
                 # Calculate relevance scores for subsections
-                subsection_texts = []
-                sub_idx = 0 # Initialize loop variable
-                while sub_idx < len(section_subsections): # Iterate through section_subsections
-                    s = section_subsections[sub_idx]
-                    subsection_texts.append(s.get('text', ''))
-                    sub_idx += 1 # Increment loop variable
-                
-                # Preprocess query
-                query = self.preprocess_query(persona, job)
+                subsection_texts = [s.text for s in section_subsections]
                 
                 # Add the query to the texts for vectorization
                 all_texts = subsection_texts + [query]
@@ -298,7 +278,7 @@ class RelevanceRanker:
                     query_vector = tfidf_matrix[-1]  # Last vector is the query
                     subsection_vectors = tfidf_matrix[:-1]  # All except the last are subsections
                     
-                    similarities = cosine_similarity(subsection_vectors, query_vector) #
+                    similarities = (subsection_vectors @ query_vector.T).toarray().ravel()
                     
                     # Select the most relevant subsection
                     best_idx = similarities.argmax()
@@ -306,9 +286,9 @@ class RelevanceRanker:
                     
                     # Create subsection analysis
                     subsection_analysis = {
-                        'document': section.get('document', ''),
-                        'refined_text': best_subsection.get('text', ''),
-                        'page_number': section.get('page_number', 0)
+                        'document': section.document,
+                        'refined_text': best_subsection.text,
+                        'page_number': section.page_number
                     }
                     
                     subsections.append(subsection_analysis)
@@ -320,31 +300,30 @@ class RelevanceRanker:
                     # If vectorization fails, use the first subsection
                     if section_subsections:
                         subsection_analysis = {
-                            'document': section.get('document', ''),
-                            'refined_text': section_subsections[0].get('text', ''),
-                            'page_number': section.get('page_number', 0)
+                            'document': section.document,
+                            'refined_text': section_subsections[0].text,
+                            'page_number': section.page_number
                         }
                         
                         subsections.append(subsection_analysis)
             else:
                 # If no subsections, use a portion of the section content
-                content = section.get('content', '')
+                content = section.content
                 if content:
                     # Take the first 200 characters as the refined text
                     refined_text = content[:200] + '...' if len(content) > 200 else content
                     
                     subsection_analysis = {
-                        'document': section.get('document', ''),
+                        'document': section.document,
                         'refined_text': refined_text,
-                        'page_number': section.get('page_number', 0)
+                        'page_number': section.page_number
                     }
                     
                     subsections.append(subsection_analysis)
-            section_idx += 1 # Increment loop variable
         
         return subsections
     
-    def process_sections(self, sections: List[Dict[str, Any]], persona: str, job: str, max_sections: int = 5) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    def process_sections(self, sections: List[Section], persona: str, job: str, max_sections: int = 5) -> Tuple[List[Section], List[Dict[str, Any]]]:
         """
         Process sections to rank them by relevance and analyze subsections.
         
@@ -371,11 +350,30 @@ class RelevanceRanker:
         
         return ranked_sections, subsection_analysis
 
+def _extract_pdf_text(pdf_path: str) -> Dict[int, str]:
+    """
+    Extract the text of one PDF for the example below.
+    
+    Defined at module level so it can be dispatched to worker processes.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        Dictionary mapping page numbers to extracted text
+    """
+    from pdf_extractor import PDFTextExtractor
+    
+    # Files are already extracted in parallel, so pages are extracted serially
+    extractor = PDFTextExtractor(debug=True, page_workers=1)
+    return extractor.extract_text_from_pdf(pdf_path)
+
 # Example usage
 if __name__ == "__main__":
+    import os
     import sys
     import json
-    from pdf_extractor import PDFTextExtractor
+    from concurrent.futures import ProcessPoolExecutor
     from section_processor import SectionProcessor
     
     if len(sys.argv) < 4:
@@ -387,59 +385,39 @@ if __name__ == "__main__":
     job = sys.argv[3]
     
     # Get PDF files
-    pdf_files = []
-    file_list = os.listdir(pdf_dir)
-    file_idx = 0 # Initialize loop variable
-    while file_idx < len(file_list): # Iterate through files
-        f = file_list[file_idx]
-        if f.endswith('.pdf'):
-            pdf_files.append(os.path.join(pdf_dir, f))
-        file_idx += 1 # Increment loop variable
+    pdf_files = [os.path.join(pdf_dir, f) for f in os.listdir(pdf_dir) if f.endswith('.pdf')]
+    
+    # Extract text from the PDFs in parallel; map() keeps the file order
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        texts = list(executor.map(_extract_pdf_text, pdf_files))
     
     # Process each PDF
     all_sections = []
-    extractor = PDFTextExtractor(debug=True)
     processor = SectionProcessor(debug=True)
     
-    pdf_path_idx = 0 # Initialize loop variable
-    while pdf_path_idx < len(pdf_files): # Iterate through pdf_files
-        pdf_path = pdf_files[pdf_path_idx]
-        # Extract text from PDF
-        text_by_page = extractor.extract_text_from_pdf(pdf_path)
-        
+    for pdf_path, text_by_page in zip(pdf_files, texts):
         # Process sections
         document_name = os.path.basename(pdf_path)
         sections = processor.process_sections(text_by_page, document_name)
         
         # Add sections to the list
-        section_item_idx = 0 # Initialize loop variable
-        while section_item_idx < len(sections): # Iterate through sections to extend
-            all_sections.append(sections[section_item_idx])
-            section_item_idx += 1 # Increment loop variable
-        
-        pdf_path_idx += 1 # Increment loop variable
+        all_sections.extend(sections)
     
     # Rank sections
     ranker = RelevanceRanker(debug=True)
     ranked_sections, subsection_analysis = ranker.process_sections(all_sections, persona, job)
     
     print(f"\nTop 5 ranked sections:")
-    i = 0 # Initialize loop variable
-    while i < len(ranked_sections) and i < 5: # Iterate through top 5 ranked sections
-        section = ranked_sections[i]
-        print(f"\n{i+1}. {section.get('section_title', 'Untitled')} (Page {section.get('page_number', 0)})")
-        print(f"   Document: {section.get('document', '')}")
-        print(f"   Relevance score: {section.get('relevance_score', 0)}")
-        print(f"   Importance rank: {section.get('importance_rank', 0)}")
-        i += 1 # Increment loop variable
+    for i, section in enumerate(ranked_sections[:5], start=1):
+        print(f"\n{i}. {section.section_title} (Page {section.page_number})")
+        print(f"   Document: {section.document}")
+        print(f"   Relevance score: {section.relevance_score}")
+        print(f"   Importance rank: {section.importance_rank}")
     
     print(f"\nSubsection analysis:")
-    i = 0 # Initialize loop variable
-    while i < len(subsection_analysis): # Iterate through subsection analysis
-        subsection = subsection_analysis[i]
-        print(f"\n{i+1}. Document: {subsection.get('document', '')}")
+    for i, subsection in enumerate(subsection_analysis, start=1):
+        print(f"\n{i}. Document: {subsection.get('document', '')}")
         print(f"   Page: {subsection.get('page_number', 0)}")
         refined_text = subsection.get('refined_text', '')
         print(f"   Refined text: {refined_text[:100]}..." if len(refined_text) > 100 else f"   Refined text: {refined_text}")
-        i += 1 # Increment loop variable
         
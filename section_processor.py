@@ -8,10 +8,68 @@ identifying sections and subsections, and preparing them for relevance ranking.
 import re
 import os
 import string
-from typing import Dict, List, Any, Tuple
+from collections import Counter
+from typing import Dict, List, Tuple
+from models import Section, Subsection
+from text_utils import collapse_whitespace
 
 # We'll use simpler text processing to avoid NLTK dependency issues
 
+# Blank-line paragraph separator used to split section content into subsections
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+
+# Common English stopwords, built once at import
+_STOP_WORDS = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you',
+    'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
+    'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
+    'that', 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing',
+    'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
+    'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
+    'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to',
+    'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
+    'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how',
+    'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
+    'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
+    's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
+])
+
+# Substrings that suggest a line is a section title
+_SECTION_KEYWORDS = ('chapter', 'section', 'part', 'introduction', 'conclusion')
+
+# Upper bound on memoized line classifications before a memo is reset
+_TITLE_CACHE_SIZE = 8192
+
+def _first_sentences(content: str, limit: int) -> List[str]:
+    """
+    Return the first period-delimited sentences of a text.
+    
+    Gives the same result as taking the non-empty pieces of content.split('.')
+    (stripped, with the period restored) and keeping the first `limit`, but
+    stops scanning once enough sentences have been found.
+    
+    Args:
+        content: Text to split into sentences
+        limit: Maximum number of sentences to return
+        
+    Returns:
+        List of at most `limit` sentences
+    """
+    sentences = []
+    start = 0
+    while len(sentences) < limit:
+        end = content.find('.', start)
+        piece = content[start:] if end == -1 else content[start:end]
+        piece = piece.strip()
+        if piece:
+            sentences.append(piece + '.')
+        if end == -1:
+            break
+        start = end + 1
+    return sentences
+
 class SectionProcessor:
     """
     Class for processing sections extracted from PDF documents.
@@ -26,23 +84,8 @@ class SectionProcessor:
         """
         self.debug = debug
         
-        # Common English stopwords
-        self.stop_words = set([
-            'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you',
-            'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
-            'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them',
-            'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
-            'that', 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
-            'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing',
-            'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
-            'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between',
-            'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to',
-            'from', 'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again',
-            'further', 'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how',
-            'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such',
-            'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
-            's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
-        ])
+        # Common English stopwords, shared by all instances
+        self.stop_words = _STOP_WORDS
         
         # Patterns for identifying section titles
         self.section_patterns = [
@@ -65,6 +108,38 @@ class SectionProcessor:
             r'^All rights reserved',
             r'^Confidential'
         ]
+        
+        # Compiled forms of the patterns above; see _refresh_patterns
+        self._pattern_key = None
+        self._refresh_patterns()
+    
+    def _refresh_patterns(self) -> None:
+        """
+        Compile section_patterns and ignore_patterns, if they changed since the last call.
+        
+        The public pattern lists may be replaced or edited after construction;
+        the compiled forms and the line classification memo are rebuilt then.
+        """
+        pattern_key = (tuple(self.section_patterns), tuple(self.ignore_patterns))
+        if pattern_key == self._pattern_key:
+            return
+        self._pattern_key = pattern_key
+        
+        self._ignore_multiline_res = [re.compile(pattern, re.MULTILINE) for pattern in self.ignore_patterns]
+        
+        # Section patterns fused into one alternation in priority order. Each
+        # pattern has a single capture group, so the title is the group given
+        # by match.lastindex.
+        self._title_re = re.compile('|'.join(f'(?:{pattern})' for pattern in self.section_patterns))
+        
+        # All ignore patterns fused into one alternation, so a single pass
+        # answers "does any of them match"
+        ignore_alternation = '|'.join(f'(?:{pattern})' for pattern in self.ignore_patterns)
+        self._ignore_combined = re.compile(ignore_alternation, re.MULTILINE)
+        self._ignore_combined_anchored = re.compile(ignore_alternation)
+        
+        # line -> (is title, title), filled by _classify
+        self._title_cache = {}
     
     def preprocess_text(self, text: str) -> str:
         """
@@ -76,21 +151,18 @@ class SectionProcessor:
         Returns:
             Preprocessed text
         """
-        # Replace multiple spaces with a single space
-        text = re.sub(r'\s+', ' ', text)
+        self._refresh_patterns()
         
-        # Fix line breaks: ensure proper line breaks for paragraphs
-        text = re.sub(r'(\w) (\w)', r'\1 \2', text)
+        # Replace every whitespace run (newlines included) with a single space
+        text = collapse_whitespace(text)
         
-        # Normalize newlines
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Remove headers and footers (common patterns)
-        pattern_idx = 0 # Initialize loop variable
-        while pattern_idx < len(self.ignore_patterns): # Iterate through ignore_patterns
-            pattern = self.ignore_patterns[pattern_idx]
-            text = re.sub(pattern, '', text, flags=re.MULTILINE)
-            pattern_idx += 1 # Increment loop variable
+        # Remove headers and footers (common patterns). One scan with the
+        # fused pattern settles the common case where nothing matches; the
+        # per-pattern passes only run when there is something to remove,
+        # since a removal can expose a match for a later pattern.
+        if self._ignore_combined.search(text):
+            for pattern in self._ignore_multiline_res:
+                text = pattern.sub('', text)
         
         return text.strip()
     
@@ -104,74 +176,103 @@ class SectionProcessor:
         Returns:
             True if the line is likely a section title, False otherwise
         """
+        self._refresh_patterns()
+        return self._match_title(line)[0]
+    
+    def extract_section_title(self, line: str) -> str:
+        """
+        Extract the section title from a line.
+        
+        Args:
+            line: Line of text
+            
+        Returns:
+            Extracted section title
+        """
+        self._refresh_patterns()
+        stripped = line.strip()
+        
+        # Check if line matches any section pattern
+        match = self._title_re.match(stripped)
+        if match:
+            return match.group(match.lastindex).strip()
+        
+        # If no pattern matches, use the line as is
+        return stripped
+    
+    def _match_title(self, line: str) -> Tuple[bool, str]:
+        """
+        Decide whether a line is a section title and extract the title in one pass.
+        
+        Gives the results of is_section_title and, for title lines,
+        extract_section_title, while matching the section patterns only once.
+        
+        Args:
+            line: Line of text
+            
+        Returns:
+            Tuple of (is section title, extracted title or empty string)
+        """
+        stripped = line.strip()
+        
         # Skip empty lines
-        if not line.strip():
-            return False
+        if not stripped:
+            return False, ''
         
         # Skip very short lines
-        if len(line.strip()) < 4:
-            return False
+        if len(stripped) < 4:
+            return False, ''
         
         # Skip lines that match ignore patterns
-        pattern_idx = 0 # Initialize loop variable
-        while pattern_idx < len(self.ignore_patterns): # Iterate through ignore_patterns
-            pattern = self.ignore_patterns[pattern_idx]
-            if re.match(pattern, line.strip()):
-                return False
-            pattern_idx += 1 # Increment loop variable
+        if self._ignore_combined_anchored.match(stripped):
+            return False, ''
         
-        # Check if line matches any section pattern
-        pattern_idx = 0 # Initialize loop variable
-        while pattern_idx < len(self.section_patterns): # Iterate through section_patterns
-            pattern = self.section_patterns[pattern_idx]
-            if re.match(pattern, line.strip()):
-                return True
-            pattern_idx += 1 # Increment loop variable
+        # Check if line matches any section pattern; the title is the captured text
+        match = self._title_re.match(stripped)
+        if match:
+            return True, match.group(match.lastindex).strip()
         
-        # Additional heuristics for section titles
+        # Additional heuristics for section titles; all of them only apply to
+        # relatively short lines (the length check counts the line as given).
+        # No pattern matched, so the title is the whole stripped line.
+        if len(line) > 50:
+            return False, ''
         
-        # All caps or title case with limited length
-        if (line.isupper() or line.istitle()) and 4 <= len(line) <= 50:
-            return True
+        # All caps or title case
+        if line.isupper() or line.istitle():
+            return True, stripped
         
-        # Ends with a colon and is relatively short
-        if line.strip().endswith(':') and len(line) <= 50:
-            return True
+        # Ends with a colon
+        if stripped.endswith(':'):
+            return True, stripped
         
         # Contains keywords that suggest a section title
-        section_keywords = ['chapter', 'section', 'part', 'introduction', 'conclusion']
-        keyword_idx = 0 # Initialize loop variable
-        while keyword_idx < len(section_keywords): # Iterate through section_keywords
-            keyword = section_keywords[keyword_idx]
-            if keyword in line.lower() and len(line) <= 50:
-                return True
-            keyword_idx += 1 # Increment loop variable
-        
-        return False
+        lower = stripped.lower()
+        for keyword in _SECTION_KEYWORDS:
+            if keyword in lower:
+                return True, stripped
+        
+        return False, ''
     
-    def extract_section_title(self, line: str) -> str:
+    def _classify(self, line: str) -> Tuple[bool, str]:
         """
-        Extract the section title from a line.
+        Classify a line as a section title and extract its title, memoized per line.
         
         Args:
             line: Line of text
             
         Returns:
-            Extracted section title
+            Tuple of (is section title, extracted title or empty string)
         """
-        # Check if line matches any section pattern
-        pattern_idx = 0 # Initialize loop variable
-        while pattern_idx < len(self.section_patterns): # Iterate through section_patterns
-            pattern = self.section_patterns[pattern_idx]
-            match = re.match(pattern, line.strip())
-            if match:
-                return match.group(1).strip()
-            pattern_idx += 1 # Increment loop variable
-        
-        # If no pattern matches, use the line as is
-        return line.strip()
+        result = self._title_cache.get(line)
+        if result is None:
+            if len(self._title_cache) >= _TITLE_CACHE_SIZE:
+                self._title_cache.clear()
+            result = self._match_title(line)
+            self._title_cache[line] = result
+        return result
     
-    def identify_sections(self, text_by_page: Dict[int, str], document_name: str) -> List[Dict[str, Any]]:
+    def identify_sections(self, text_by_page: Dict[int, str], document_name: str) -> List[Section]:
         """
         Identify sections within the extracted text.
         
@@ -182,89 +283,60 @@ class SectionProcessor:
         Returns:
             List of identified sections with page numbers, titles, and content
         """
+        self._refresh_patterns()
+        
         sections = []
         current_section = None
+        current_lines = []  # Content lines of the current section, joined when it closes
         
-        # Process each page
-        page_nums_sorted = sorted(text_by_page.keys())
-        page_num_idx = 0 # Initialize loop variable
-        while page_num_idx < len(page_nums_sorted): # Iterate through page numbers
-            page_num = page_nums_sorted[page_num_idx]
-            if isinstance(page_num, str):  # Skip metadata keys
-                page_num_idx += 1 # Increment loop variable
-                continue
-                
+        # Process each page; metadata keys (strings) are filtered out once up front
+        # and the filtered keys are reused by the fallback below
+        page_keys = [key for key in text_by_page if not isinstance(key, str)]
+        for page_num in sorted(page_keys):
             text = text_by_page[page_num]
-            lines = text.split('\n')
             
-            line_idx = 0
-            while line_idx < len(lines):
-                line = lines[line_idx].strip()
+            for raw_line in text.split('\n'):
+                line = raw_line.strip()
                 
                 # Skip empty lines
                 if not line:
-                    line_idx += 1
                     continue
                 
                 # Check if line is a section title
-                if self.is_section_title(line):
-                    section_title = self.extract_section_title(line)
-                    
+                is_title, section_title = self._classify(line)
+                if is_title:
                     # If we have a current section, finalize it
                     if current_section:
+                        current_section.content = '\n'.join(current_lines)
                         sections.append(current_section)
                     
                     # Start a new section
-                    current_section = {
-                        'document': document_name,
-                        'section_title': section_title,
-                        'page_number': page_num,
-                        'content': '',
-                        'subsections': []
-                    }
+                    current_section = Section(document_name, section_title, page_num)
+                    current_lines = []
                 else:
                     # Add line to current section content
                     if current_section:
-                        if current_section['content']:
-                            current_section['content'] += '\n'
-                        current_section['content'] += line
-                
-                line_idx += 1
-            page_num_idx += 1 # Increment loop variable
+                        current_lines.append(line)
         
         # Add the last section if it exists
         if current_section:
+            current_section.content = '\n'.join(current_lines)
             sections.append(current_section)
         
         # If no sections were found, create a default section for each page
         if not sections:
-            page_keys = list(text_by_page.keys())
-            page_key_idx = 0 # Initialize loop variable
-            while page_key_idx < len(page_keys): # Iterate through page keys
-                page_num = page_keys[page_key_idx]
-                if isinstance(page_num, str):  # Skip metadata keys
-                    page_key_idx += 1 # Increment loop variable
-                    continue
-                
+            for page_num in page_keys:
                 text = text_by_page[page_num]
-                lines = text.split('\n')
-                title = lines[0].strip() if lines and lines[0].strip() else f"Page {page_num}"
                 
-                # Create a section for this page
-                section = {
-                    'document': document_name,
-                    'section_title': title,
-                    'page_number': page_num,
-                    'content': text,
-                    'subsections': []
-                }
+                # Only the first line is needed for the title
+                title = text.split('\n', 1)[0].strip() or f"Page {page_num}"
                 
-                sections.append(section)
-                page_key_idx += 1 # Increment loop variable
+                # Create a section for this page
+                sections.append(Section(document_name, title, page_num, text))
         
         return sections
     
-    def identify_subsections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def identify_subsections(self, sections: List[Section]) -> List[Section]:
         """
         Identify subsections within each section.
         
@@ -274,33 +346,31 @@ class SectionProcessor:
         Returns:
             Updated list of sections with identified subsections
         """
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(sections): # Iterate through sections
-            section = sections[section_idx]
-            content = section.get('content', '')
-            
-            # Split content into paragraphs
-            paragraphs = re.split(r'\n\s*\n', content)
-            
-            # Process each paragraph as a potential subsection
-            paragraph_idx = 0 # Initialize loop variable
-            while paragraph_idx < len(paragraphs): # Iterate through paragraphs
-                paragraph = paragraphs[paragraph_idx]
-                if len(paragraph.strip()) > 50:  # Minimum length for a subsection
-                    # Clean and preprocess the paragraph
-                    cleaned_paragraph = self.preprocess_text(paragraph)
-                    
-                    subsection = {
-                        'text': cleaned_paragraph,
-                        'page_number': section['page_number']
-                    }
-                    
-                    section['subsections'].append(subsection)
-                paragraph_idx += 1 # Increment loop variable
-            section_idx += 1 # Increment loop variable
+        for section in sections:
+            self._add_subsections(section)
         
         return sections
     
+    def _add_subsections(self, section: Section) -> None:
+        """
+        Split one section's content into paragraphs and attach them as subsections.
+        
+        Args:
+            section: Section to update in place
+        """
+        # Split content into paragraphs
+        paragraphs = _PARA_SPLIT_RE.split(section.content)
+        
+        # Process each paragraph as a potential subsection
+        for paragraph in paragraphs:
+            # Minimum length for a subsection; the raw length bounds the
+            # stripped one, so short paragraphs are never copied
+            if len(paragraph) > 50 and len(paragraph.strip()) > 50:
+                # Clean and preprocess the paragraph
+                cleaned_paragraph = self.preprocess_text(paragraph)
+                
+                section.subsections.append(Subsection(cleaned_paragraph, section.page_number))
+    
     def extract_keywords(self, text: str, top_n: int = 10) -> List[str]:
         """
         Extract keywords from text for improved relevance ranking.
@@ -312,49 +382,30 @@ class SectionProcessor:
         Returns:
             List of extracted keywords
         """
-        # Simple word tokenization (split by whitespace)
-        words = text.lower().split()
-        
-        # Remove punctuation
-        cleaned_words = []
-        word_idx = 0 # Initialize loop variable
-        while word_idx < len(words): # Iterate through words
-            word = words[word_idx]
-            cleaned_words.append(word.strip(string.punctuation))
-            word_idx += 1 # Increment loop variable
-        words = cleaned_words
-        
-        # Remove stopwords and very short words
-        filtered_words = []
-        word_idx = 0 # Initialize loop variable
-        while word_idx < len(words): # Iterate through words
-            word = words[word_idx]
-            if word and word not in self.stop_words and len(word) > 2:
-                filtered_words.append(word)
-            word_idx += 1 # Increment loop variable
-        words = filtered_words
-        
-        # Count word frequencies
-        word_freq = {}
-        word_idx = 0 # Initialize loop variable
-        while word_idx < len(words): # Iterate through words
-            word = words[word_idx]
-            word_freq[word] = word_freq.get(word, 0) + 1
-            word_idx += 1 # Increment loop variable
-        
-        # Sort by frequency
-        sorted_words_items = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        
-        # Return top N keywords
-        keywords_list = []
-        sorted_word_item_idx = 0 # Initialize loop variable
-        while sorted_word_item_idx < len(sorted_words_items) and sorted_word_item_idx < top_n: # Iterate through top N
-            word, freq = sorted_words_items[sorted_word_item_idx]
-            keywords_list.append(word)
-            sorted_word_item_idx += 1 # Increment loop variable
-        return keywords_list
+        # Sections with no content (a title directly followed by another
+        # title) have nothing to count
+        if not text or text.isspace():
+            return []
+        
+        # Simple word tokenization (split by whitespace), counted in C so the
+        # cleanup below runs once per distinct token rather than per word
+        token_counts = Counter(text.lower().split())
+        
+        # Remove punctuation, then stopwords and very short words. Tokens are
+        # visited in first-occurrence order, so each cleaned word keeps the
+        # position of its earliest occurrence for tie-breaking.
+        stop_words = self.stop_words
+        punctuation = string.punctuation
+        word_freq = Counter()
+        for token, count in token_counts.items():
+            word = token.strip(punctuation)
+            if word and word not in stop_words and len(word) > 2:
+                word_freq[word] += count
+        
+        # Return top N keywords by frequency
+        return [word for word, _ in word_freq.most_common(top_n)]
     
-    def enrich_sections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def enrich_sections(self, sections: List[Section]) -> List[Section]:
         """
         Enrich sections with additional metadata for improved relevance ranking.
         
@@ -364,40 +415,33 @@ class SectionProcessor:
         Returns:
             Enriched list of sections
         """
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(sections): # Iterate through sections
-            section = sections[section_idx]
-            # Extract keywords from section content
-            content = section.get('content', '')
-            keywords = self.extract_keywords(content)
-            
-            # Add keywords to section metadata
-            section['keywords'] = keywords
-            
-            # Extract sentences for potential use in subsection analysis (simple split by period)
-            sentences_raw = content.split('.')
-            sentences = []
-            sentence_raw_idx = 0 # Initialize loop variable
-            while sentence_raw_idx < len(sentences_raw): # Iterate through raw sentences
-                s = sentences_raw[sentence_raw_idx]
-                if s.strip():
-                    sentences.append(s.strip() + '.')
-                sentence_raw_idx += 1 # Increment loop variable
-            
-            section['sentences'] = []
-            sentence_idx = 0 # Initialize loop variable
-            while sentence_idx < len(sentences) and sentence_idx < 5: # Store first 5 sentences
-                section['sentences'].append(sentences[sentence_idx])
-                sentence_idx += 1 # Increment loop variable
-            
-            # Calculate section length (word count)
-            words = content.split()
-            section['word_count'] = len(words)
-            section_idx += 1 # Increment loop variable
+        for section in sections:
+            self._enrich_section(section)
         
         return sections
     
-    def process_sections(self, text_by_page: Dict[int, str], document_name: str) -> List[Dict[str, Any]]:
+    def _enrich_section(self, section: Section) -> None:
+        """
+        Set keywords, leading sentences and word count on one section.
+        
+        Args:
+            section: Section to update in place
+        """
+        # Extract keywords from section content
+        content = section.content
+        keywords = self.extract_keywords(content)
+        
+        # Add keywords to section metadata
+        section.keywords = keywords
+        
+        # Extract sentences for potential use in subsection analysis (simple split by period)
+        section.sentences = _first_sentences(content, 5)
+        
+        # Calculate section length (word count)
+        words = content.split()
+        section.word_count = len(words)
+    
+    def process_sections(self, text_by_page: Dict[int, str], document_name: str) -> List[Section]:
         """
         Process sections from extracted text.
         
@@ -411,11 +455,11 @@ class SectionProcessor:
         # Identify sections
         sections = self.identify_sections(text_by_page, document_name)
         
-        # Identify subsections
-        sections = self.identify_subsections(sections)
-        
-        # Enrich sections with additional metadata
-        sections = self.enrich_sections(sections)
+        # Identify subsections and enrich each section with additional
+        # metadata in one pass over the sections
+        for section in sections:
+            self._add_subsections(section)
+            self._enrich_section(section)
         
         return sections
 
@@ -440,12 +484,9 @@ if __name__ == "__main__":
     sections = processor.process_sections(text_by_page, document_name)
     
     print(f"\nFound {len(sections)} processed sections:")
-    i = 0 # Initialize loop variable
-    while i < len(sections): # Iterate through sections
-        section = sections[i]
-        print(f"\n{i+1}. {section['section_title']} (Page {section['page_number']})")
-        print(f"   Keywords: {', '.join(section['keywords'])}")
-        print(f"   Word count: {section['word_count']}")
-        print(f"   Subsections: {len(section['subsections'])}")
-        i += 1 # Increment loop variable
+    for i, section in enumerate(sections, 1):
+        print(f"\n{i}. {section.section_title} (Page {section.page_number})")
+        print(f"   Keywords: {', '.join(section.keywords)}")
+        print(f"   Word count: {section.word_count}")
+        print(f"   Subsections: {len(section.subsections)}")
                          
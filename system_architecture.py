@@ -14,13 +14,23 @@ Constraints:
 
 import os
 import json
-import PyPDF2 #
 import re
 import datetime
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Tuple, Optional
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer #
-from sklearn.metrics.pairwise import cosine_similarity #
+
+# orjson is a C extension and serializes much faster than the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# PyMuPDF is a C-backed parser and much faster than PyPDF2; use it when present
+try:
+    import fitz # PyMuPDF
+except ImportError:
+    fitz = None
 
 class PDFTextExtractor:
     """
@@ -35,6 +45,8 @@ class PDFTextExtractor:
         """
         Extract text from a PDF file, organized by page number.
         
+        Uses PyMuPDF when it is installed and falls back to PyPDF2 otherwise.
+        
         Args:
             pdf_path: Path to the PDF file
             
@@ -44,17 +56,26 @@ class PDFTextExtractor:
         text_by_page = {}
         
         try:
+            if fitz is not None:
+                with fitz.open(pdf_path) as doc:
+                    for i, page in enumerate(doc):
+                        text = page.get_text("text")
+                        if text:
+                            text_by_page[i+1] = text  # Page numbers start from 1
+                
+                return text_by_page
+            
+            # Only the fallback needs PyPDF2, so it is imported on demand
+            import PyPDF2
+            
             with open(pdf_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file) #
                 
                 # Extract text from each page
-                i = 0 # Initialize loop variable
-                while i < len(reader.pages): # Iterate through pages
-                    page = reader.pages[i]
+                for i, page in enumerate(reader.pages):
                     text = page.extract_text() #
                     if text:
                         text_by_page[i+1] = text  # Page numbers start from 1
-                    i += 1 # Increment loop variable
                 
             return text_by_page
         except Exception as e:
@@ -75,64 +96,59 @@ class SectionIdentifier:
             r'^(\d+\.\s+[A-Z][A-Za-z\s\-:]{3,50})$',  # Numbered sections
             r'^(Chapter\s+\d+[\s\-:]+[A-Za-z\s\-:]{3,50})$',  # Chapter headings
         ]
+        
+        # All patterns fused into one alternation in priority order, so each line
+        # needs a single match; the title is the one group that participated
+        self._combined = re.compile('|'.join(f'(?:{pattern})' for pattern in self.section_patterns))
+        
+        # Every pattern above starts with an uppercase letter or a digit, so only
+        # lines whose first non-blank character is one of those can be titles
+        self._candidate_re = re.compile(r'^[^\S\n]*[A-Z\d]', re.MULTILINE)
     
-    def identify_sections(self, text_by_page: Dict[int, str]) -> List[Dict[str, Any]]:
+    def identify_sections(self, text_by_page: Dict[int, str], document_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Identify sections within the extracted text.
         
         Args:
             text_by_page: Dictionary mapping page numbers to extracted text
+            document_name: Name of the document; when omitted it is taken from a
+                '_path' entry in text_by_page, as older callers provide
             
         Returns:
             List of identified sections with page numbers and titles
         """
         sections = []
+        if document_name is None:
+            document_name = os.path.basename(text_by_page.get('_path', 'unknown'))
         
-        page_nums = list(text_by_page.keys()) # Get keys to iterate with index
-        page_num_idx = 0 # Initialize loop variable
-        while page_num_idx < len(page_nums): # Iterate through page numbers
-            page_num = page_nums[page_num_idx]
-            text = text_by_page[page_num]
-            # Split text into lines for analysis
-            lines = text.split('\n')
-            
-            line_idx = 0 # Initialize loop variable
-            while line_idx < len(lines): # Iterate through lines
-                line = lines[line_idx]
-                # Skip empty lines
-                if not line.strip():
-                    line_idx += 1 # Increment loop variable
-                    continue
+        for page_num, text in text_by_page.items():
+            # Only lines whose first non-blank character can start a title are
+            # visited; they are found with one scan of the whole page
+            for candidate in self._candidate_re.finditer(text):
+                line_start = candidate.start()
+                line_end = text.find('\n', line_start)
+                if line_end == -1:
+                    line_end = len(text)
+                line = text[line_start:line_end]
                 
-                # Check if line matches any section pattern
-                pattern_idx = 0 # Initialize loop variable
-                while pattern_idx < len(self.section_patterns): # Iterate through section patterns
-                    pattern = self.section_patterns[pattern_idx]
-                    match = re.match(pattern, line.strip())
-                    if match:
-                        section_title = match.group(1).strip()
-                        
-                        # Skip very short titles or common headers/footers
-                        if len(section_title) < 4 or section_title.lower() in ['page', 'contents', 'index']:
-                            pattern_idx += 1 # Increment and continue to next pattern
-                            continue
-                        
-                        # Extract content following the section title
-                        content_start = line_idx + 1
-                        content_end = len(lines)
-                        content = '\n'.join(lines[content_start:content_end])
+                # Check if line matches any section pattern. A title rejected
+                # below can never match a later pattern, so the first matching
+                # alternative decides the line.
+                match = self._combined.match(line.strip())
+                if match:
+                    section_title = match.group(match.lastindex).strip()
+                    
+                    # Skip very short titles or common headers/footers
+                    if len(section_title) >= 4 and section_title.lower() not in ['page', 'contents', 'index']:
+                        # Content is everything on the page after the title line
+                        content = text[line_end + 1:]
                         
                         sections.append({
-                            'document': os.path.basename(text_by_page.get('_path', 'unknown')),
+                            'document': document_name,
                             'section_title': section_title,
                             'page_number': page_num,
                             'content': content
                         })
-                        
-                        break # Break from pattern loop
-                    pattern_idx += 1 # Increment loop variable
-                line_idx += 1 # Increment loop variable
-            page_num_idx += 1 # Increment loop variable
         
         return sections
 
@@ -143,10 +159,15 @@ class RelevanceRanker:
     """
     
     def __init__(self):
+        # scikit-learn is imported here rather than at module level so that
+        # document workers, which only extract text, do not pay for importing it
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
         self.vectorizer = TfidfVectorizer( #
             stop_words='english',
             max_features=5000,
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            norm='l2'  # rank_sections relies on unit-length rows for its dot-product cosine
         )
     
     def rank_sections(self, sections: List[Dict[str, Any]], persona: str, job: str) -> List[Dict[str, Any]]:
@@ -168,12 +189,7 @@ class RelevanceRanker:
         query = f"{persona} {job}"
         
         # Extract section content for vectorization
-        section_texts = []
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(sections): # Iterate through sections
-            section = sections[section_idx]
-            section_texts.append(section['content'])
-            section_idx += 1 # Increment loop variable
+        section_texts = [section['content'] for section in sections]
         
         # Add the query to the texts for vectorization
         all_texts = section_texts + [query]
@@ -186,35 +202,30 @@ class RelevanceRanker:
             query_vector = tfidf_matrix[-1]  # Last vector is the query
             section_vectors = tfidf_matrix[:-1]  # All except the last are sections
             
-            similarities = cosine_similarity(section_vectors, query_vector) #
-            
-            # Add relevance scores to sections
-            i = 0 # Initialize loop variable
-            while i < len(sections): # Iterate through sections
-                section = sections[i]
-                section['relevance_score'] = float(similarities[i][0])
-                i += 1 # Increment loop variable
+            # TF-IDF rows are already L2-normalized, so the cosine similarity is a
+            # plain sparse dot product with the query
+            similarities = (section_vectors @ query_vector.T).toarray().ravel()
             
-            # Sort sections by relevance score (descending)
-            ranked_sections = sorted(sections, key=lambda x: x['relevance_score'], reverse=True)
+            # Sort sections by relevance score (descending); a stable sort keeps
+            # tied sections in document order, as sorted(reverse=True) did
+            order = np.argsort(-similarities, kind='stable').tolist()
+            scores = similarities.tolist()
             
-            # Add importance rank
-            i = 0 # Initialize loop variable
-            while i < len(ranked_sections): # Iterate through ranked_sections
-                section = ranked_sections[i]
-                section['importance_rank'] = i + 1
-                i += 1 # Increment loop variable
+            # Add relevance scores and importance ranks in a single pass
+            ranked_sections = []
+            for rank, i in enumerate(order, 1):
+                section = sections[i]
+                section['relevance_score'] = scores[i]
+                section['importance_rank'] = rank
+                ranked_sections.append(section)
             
             return ranked_sections
         except Exception as e:
             print(f"Error ranking sections: {e}")
             # If vectorization fails, return sections in original order
-            i = 0 # Initialize loop variable
-            while i < len(sections): # Iterate through sections
-                section = sections[i]
-                section['importance_rank'] = i + 1
+            for rank, section in enumerate(sections, 1):
+                section['importance_rank'] = rank
                 section['relevance_score'] = 0.0
-                i += 1 # Increment loop variable
             
             return sections
 
@@ -225,7 +236,8 @@ class SubsectionAnalyzer:
     """
     
     def __init__(self):
-        pass
+        # Blank-line paragraph separator
+        self._paragraph_break_re = re.compile(r'\n\s*\n')
     
     def analyze_subsections(self, ranked_sections: List[Dict[str, Any]], max_subsections: int = 5) -> List[Dict[str, Any]]:
         """
@@ -241,36 +253,28 @@ class SubsectionAnalyzer:
         subsections = []
         
         # Take top sections based on importance rank
-        top_sections = []
-        s_idx = 0 # Initialize loop variable
-        while s_idx < len(ranked_sections): # Iterate through ranked_sections
-            s = ranked_sections[s_idx]
-            if s['importance_rank'] <= max_subsections:
-                top_sections.append(s)
-            s_idx += 1 # Increment loop variable
+        top_sections = [s for s in ranked_sections if s['importance_rank'] <= max_subsections]
         
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(top_sections): # Iterate through top_sections
-            section = top_sections[section_idx]
-            # Extract content and split into paragraphs
+        for section in top_sections:
+            # Extract content; only the first paragraph is needed, so stop at
+            # the first paragraph break instead of splitting all of it
             content = section.get('content', '')
-            paragraphs = re.split(r'\n\s*\n', content)
+            paragraph_break = self._paragraph_break_re.search(content)
             
             # Take the most relevant paragraph (usually the first one)
-            if paragraphs:
-                refined_text = paragraphs[0].strip()
-                
-                # Clean up the text (remove excessive whitespace, etc.)
-                refined_text = re.sub(r'\s+', ' ', refined_text)
-                
-                subsection = {
-                    'document': section['document'],
-                    'refined_text': refined_text,
-                    'page_number': section['page_number']
-                }
-                
-                subsections.append(subsection)
-            section_idx += 1 # Increment loop variable
+            first_paragraph = content[:paragraph_break.start()] if paragraph_break else content
+            
+            # Clean up the text (remove excessive whitespace, etc.); split()
+            # also drops leading/trailing whitespace, so no strip is needed
+            refined_text = ' '.join(first_paragraph.split())
+            
+            subsection = {
+                'document': section['document'],
+                'refined_text': refined_text,
+                'page_number': section['page_number']
+            }
+            
+            subsections.append(subsection)
         
         return subsections
 
@@ -288,7 +292,8 @@ class OutputGenerator:
                         job: str,
                         ranked_sections: List[Dict[str, Any]],
                         subsections: List[Dict[str, Any]],
-                        max_sections: int = 5) -> Dict[str, Any]:
+                        max_sections: int = 5,
+                        timestamp: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate the final output in the required JSON format.
         
@@ -299,32 +304,34 @@ class OutputGenerator:
             ranked_sections: List of ranked sections
             subsections: List of analyzed subsections
             max_sections: Maximum number of sections to include in the output
+            timestamp: Processing timestamp to record; defaults to the current time.
+                Callers generating several outputs can compute it once and pass it in.
             
         Returns:
             Dictionary containing the final output in the required format
         """
+        if timestamp is None:
+            timestamp = datetime.datetime.now().isoformat()
+        
         # Prepare metadata
         metadata = {
             'input_documents': input_documents,
             'persona': persona,
             'job_to_be_done': job,
-            'processing_timestamp': datetime.datetime.now().isoformat()
+            'processing_timestamp': timestamp
         }
         
         # Prepare extracted sections (top N based on importance rank)
-        extracted_sections = []
-        section_idx = 0 # Initialize loop variable
-        while section_idx < len(ranked_sections): # Iterate through ranked_sections
-            section = ranked_sections[section_idx]
-            if section['importance_rank'] <= max_sections:
-                extracted_section = {
-                    'document': section['document'],
-                    'section_title': section['section_title'],
-                    'importance_rank': section['importance_rank'],
-                    'page_number': section['page_number']
-                }
-                extracted_sections.append(extracted_section)
-            section_idx += 1 # Increment loop variable
+        extracted_sections = [
+            {
+                'document': section['document'],
+                'section_title': section['section_title'],
+                'importance_rank': section['importance_rank'],
+                'page_number': section['page_number']
+            }
+            for section in ranked_sections
+            if section['importance_rank'] <= max_sections
+        ]
         
         # Prepare final output
         output = {
@@ -335,18 +342,44 @@ class OutputGenerator:
         
         return output
 
+def _extract_and_identify(pdf_path: str) -> List[Dict[str, Any]]:
+    """
+    Extract the text of a single PDF and identify its sections.
+    
+    Defined at module level so it can be dispatched to worker processes.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        List of identified sections for the document
+    """
+    # Extract text from PDF
+    text_by_page = PDFTextExtractor().extract_text(pdf_path)
+    
+    # Identify sections
+    return SectionIdentifier().identify_sections(text_by_page, os.path.basename(pdf_path))
+
 class DocumentIntelligenceSystem:
     """
     Main system class that orchestrates the document intelligence process.
     """
     
     def __init__(self):
-        self.extractor = PDFTextExtractor()
-        self.identifier = SectionIdentifier()
-        self.ranker = RelevanceRanker()
+        # Documents are extracted and split into sections by _extract_and_identify.
+        # The ranker is built on first use; see the ranker property
+        self._ranker = None
         self.analyzer = SubsectionAnalyzer()
         self.generator = OutputGenerator()
     
+    @property
+    def ranker(self):
+        """Relevance ranker, created on first access."""
+        if self._ranker is None:
+            # Built lazily so that scikit-learn is not loaded until sections are ranked
+            self._ranker = RelevanceRanker()
+        return self._ranker
+    
     def process_documents(self, input_json_path: str, output_json_path: str) -> None:
         """
         Process documents based on the input JSON and generate the output JSON.
@@ -366,46 +399,27 @@ class DocumentIntelligenceSystem:
             job = input_data.get('job_to_be_done', {}).get('task', '')
             
             # Get document filenames and paths
-            document_filenames = []
-            doc_idx = 0 # Initialize loop variable
-            while doc_idx < len(documents): # Iterate through documents
-                doc = documents[doc_idx]
-                document_filenames.append(doc.get('filename', ''))
-                doc_idx += 1 # Increment loop variable
-
-            document_paths = []
+            document_filenames = [doc.get('filename', '') for doc in documents]
             
             # Determine the base directory for PDFs
             input_dir = os.path.dirname(input_json_path)
             pdf_dir = os.path.join(input_dir, 'PDFs')
             
-            filename_idx = 0 # Initialize loop variable
-            while filename_idx < len(document_filenames): # Iterate through document_filenames
-                filename = document_filenames[filename_idx]
-                pdf_path = os.path.join(pdf_dir, filename)
-                document_paths.append(pdf_path)
-                filename_idx += 1 # Increment loop variable
+            document_paths = [os.path.join(pdf_dir, filename) for filename in document_filenames]
             
-            # Process each document
+            # Process each document; PDFs are independent, so spread them across processes
             all_sections = []
-            pdf_path_idx = 0 # Initialize loop variable
-            while pdf_path_idx < len(document_paths): # Iterate through document_paths
-                pdf_path = document_paths[pdf_path_idx]
-                # Extract text from PDF
-                text_by_page = self.extractor.extract_text(pdf_path)
-                
-                # Add the PDF path to the text_by_page dictionary for reference
-                text_by_page['_path'] = pdf_path
-                
-                # Identify sections
-                sections = self.identifier.identify_sections(text_by_page)
-                
-                # Add sections to the list
-                section_item_idx = 0 # Initialize loop variable
-                while section_item_idx < len(sections): # Iterate through sections to extend
-                    all_sections.append(sections[section_item_idx])
-                    section_item_idx += 1 # Increment loop variable
-                pdf_path_idx += 1 # Increment loop variable
+            max_workers = min(os.cpu_count() or 1, len(document_paths))
+            if max_workers > 1:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    # map() keeps results in document order so ranking stays deterministic
+                    results = list(executor.map(_extract_and_identify, document_paths))
+            else:
+                results = [_extract_and_identify(pdf_path) for pdf_path in document_paths]
+            
+            # Add sections to the list
+            for sections in results:
+                all_sections.extend(sections)
             
             # Rank sections by relevance
             ranked_sections = self.ranker.rank_sections(all_sections, persona, job)
@@ -423,8 +437,12 @@ class DocumentIntelligenceSystem:
             )
             
             # Write output to JSON file
-            with open(output_json_path, 'w') as f:
-                json.dump(output, f, indent=4)
+            if orjson is not None:
+                with open(output_json_path, 'wb') as f:
+                    f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_json_path, 'w') as f:
+                    json.dump(output, f, indent=4)
             
             print(f"Output written to {output_json_path}")
         
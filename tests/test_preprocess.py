@@ -0,0 +1,89 @@
+"""
+Regression tests for text preprocessing.
+
+The optimized preprocessing must produce exactly the same text as the original
+chain of re.sub calls it replaced.
+
+Run with: python -m unittest discover tests
+"""
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_extractor import _preprocess_page_text
+from section_processor import SectionProcessor
+
+# Representative page text: headers and footers, blank lines, Windows and old Mac
+# line endings, tabs, non-breaking and other Unicode spaces, and edge whitespace
+SAMPLE_TEXTS = [
+    '',
+    ' ',
+    '\n\n',
+    'Introduction',
+    'Page 1\nIntroduction\nThis is the first paragraph.\n\nSecond paragraph here.\nPage 1 of 10',
+    '  Leading and trailing spaces  ',
+    'Title\r\nBody line one\r\nBody line two\rLast line\r',
+    'Column one\tColumn two\t\tColumn three',
+    'Non\u00a0breaking\u2003em\u2009thin\u3000ideographic spaces',
+    '1. Getting Started\n\nInstall the package.\n   \n2. Usage\f\vDetails follow.',
+    'Chapter 3: Nice\nThe city of Nice is on the coast.\nPage 12\n',
+    'a b c d e f g h',
+    'Mixed  CASE   Words\n\n\n  indented line\n\t\ttabbed line',
+    'Page 7',
+    '42',
+    'March 2024',
+    'Copyright 2024 Example Inc.\nAll rights reserved',
+    'Confidential draft\n\nContents follow',
+]
+
+def _original_preprocess_page_text(text):
+    """The page preprocessing as originally implemented in PDFTextExtractor."""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'(\w) (\w)', r'\1 \2', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = re.sub(r'^.*Page \d+.*\n', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\n.*Page \d+.*$', '', text, flags=re.MULTILINE)
+    return text
+
+def _original_section_preprocess_text(text, ignore_patterns):
+    """SectionProcessor.preprocess_text as originally implemented."""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'(\w) (\w)', r'\1 \2', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    for pattern in ignore_patterns:
+        text = re.sub(pattern, '', text, flags=re.MULTILINE)
+    return text.strip()
+
+class PreprocessPageTextTest(unittest.TestCase):
+    """pdf_extractor._preprocess_page_text matches the original implementation."""
+
+    def test_matches_original(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(_preprocess_page_text(text), _original_preprocess_page_text(text))
+
+    def test_collapses_whitespace(self):
+        self.assertEqual(_preprocess_page_text('Fix  words\n\tsplit by spaces'), 'Fix words split by spaces')
+
+class SectionPreprocessTextTest(unittest.TestCase):
+    """SectionProcessor.preprocess_text matches the original implementation."""
+
+    def setUp(self):
+        self.processor = SectionProcessor()
+
+    def test_matches_original(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(self.processor.preprocess_text(text),
+                                 _original_section_preprocess_text(text, self.processor.ignore_patterns))
+
+    def test_normalizes_whitespace(self):
+        self.assertEqual(self.processor.preprocess_text('  Fix  words\r\nsplit\tby spaces \n'),
+                         'Fix words split by spaces')
+
+if __name__ == '__main__':
+    unittest.main()
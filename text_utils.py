@@ -0,0 +1,31 @@
+"""
+Text Utilities Module
+
+This module provides small text-normalization helpers shared by the PDF
+extraction and section processing modules.
+"""
+
+def collapse_whitespace(text: str) -> str:
+    """
+    Replace every run of whitespace with a single space.
+    
+    Equivalent to re.sub(r'\s+', ' ', text) (str.split() and \s use the same
+    Unicode whitespace definition) but runs entirely in C.
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        Text with collapsed whitespace
+    """
+    collapsed = ' '.join(text.split())
+    
+    # str.split() drops leading/trailing runs; the regex keeps one space for each
+    if not collapsed:
+        return ' ' if text else ''
+    if text[0].isspace():
+        collapsed = ' ' + collapsed
+    if text[-1].isspace():
+        collapsed += ' '
+    
+    return collapsed